@@ -1,8 +1,9 @@
 # Import required libraries
 import sys
 import random
-import json
 import time
+from functools import lru_cache
+from math import isqrt
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -13,141 +14,283 @@ from PyQt5.QtWidgets import (
     QLabel,
     QStatusBar,
 )
-from PyQt5.QtCore import QTimer
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtCore import QEvent, Qt, QTimer
+import numpy as np
+import orjson
 from network_monitor import NetworkMonitor
 from network_node import NetworkNode
 
+# Stylesheet for the whole window, parsed once and matched by object name
+STYLESHEET = """
+    * {
+        background-color: white;
+    }
+    QLabel#SectionTitle {
+        font-weight: bold;
+        font-size: 14px;
+        padding: 5px;
+        background-color: #f0f0f0;
+        border-radius: 5px;
+        color: black;
+    }
+    QLabel#StatusLabel {
+        color: black;
+    }
+    QLabel#NodeList, QLabel#StatsLabel {
+        padding: 5px;
+        background-color: white;
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        color: black;
+    }
+    QLabel#StatsLabel {
+        margin: 2px;
+    }
+    QLabel#MasterLegend {
+        color: red;
+        padding: 5px;
+    }
+    QLabel#SlaveLegend {
+        color: blue;
+        padding: 5px;
+    }
+    QPushButton {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 5px;
+        padding: 8px;
+        margin: 2px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #e9ecef;
+        border-color: #ced4da;
+    }
+    QPushButton:pressed {
+        background-color: #dee2e6;
+    }
+"""
+
+
+# Scale of the drone icons relative to the source images
+ICON_ZOOM = 0.15
+
+# Upper bound on view updates per second; topology changes trigger full redraws
+MAX_REDRAW_RATE = 20
+
+
+def _shrink_image(img, step):
+    """Block-average an image down by an integer step, weighting colour by alpha"""
+    if img.shape[2] == 3:
+        img = np.dstack([img, np.ones(img.shape[:2], img.dtype)])
+    height, width = img.shape[:2]
+    img = np.pad(img, ((0, -height % step), (0, -width % step), (0, 0)))
+    blocks = img.reshape(img.shape[0] // step, step, img.shape[1] // step, step, 4)
+    alpha = blocks[..., 3:]
+    coverage = alpha.sum(axis=(1, 3))
+    rgb = (blocks[..., :3] * alpha).sum(axis=(1, 3)) / np.maximum(coverage, 1e-6)
+    # Rounding can push the weighted mean just past the source range
+    rgb = np.clip(rgb, 0, img[..., :3].max())
+    return np.dstack([rgb, coverage / step ** 2]).astype(img.dtype)
+
+
+@lru_cache(maxsize=64)
+def _pyramid_layers(num_nodes):
+    """Nodes per pyramid layer (master excluded), cached as a tuple"""
+    # Layer k holds 2k - 1 nodes, so the first k layers hold k * k nodes
+    nodes_left = max(num_nodes - 1, 0)  # Excluding master node
+    full_layers = isqrt(nodes_left)
+    layers = tuple(2 * k - 1 for k in range(1, full_layers + 1))
+    remainder = nodes_left - full_layers * full_layers
+    return layers + (remainder,) if remainder else layers
+
 
 class NetworkVisualizerWindow(QMainWindow):
     """
     Main window class for the network visualizer application
     """
 
+    # Fallback circle colors as RGBA, i.e. "red" and "lightblue"
+    _MASTER_RGBA = np.array([1.0, 0.0, 0.0, 1.0])
+    _SLAVE_RGBA = np.array([173, 216, 230, 255]) / 255
+
     def __init__(self, config_file="network_config.json"):
         super().__init__()
         # Set window properties
         self.setWindowTitle("Self-Organizing Network Visualizer")
         self.setGeometry(100, 100, 1400, 900)
 
-        # Load drone images
-        try:
-            self.leader_img = plt.imread("drone_leader.png")
-            self.follower_img = plt.imread("drone_follower.png")
-        except Exception as e:
-            print(f"Error loading drone images: {e}")
-            # Fallback to simple shapes if images can't be loaded
-            self.leader_img = None
-            self.follower_img = None
-
         # Initialize network components
         self.nodes = {}
-        self.network_graph = nx.Graph()
+        self._sorted_nodes = []  # Nodes ordered by port, for the node list
+        self._last_status = None  # Master and node ids last shown in the status labels
+        self.network_edges = set()  # Set of (node1_id, node2_id) tuples, node1_id < node2_id
         self.master_node = None
+        self._pending_deaths = set()  # Node ids reported dead, not yet removed
 
-        # Load network configuration
+        # Load network configuration; node settings are extracted once so
+        # that restoring the network does not repeat the dict lookups
         self.config = self._load_config(config_file)
+        self._base_port = self.config["network"]["base_port"]
+        self._node_specs = tuple(
+            (node_config["host"], node_config["port"], node_config["is_master"])
+            for node_config in self.config["network"]["nodes"]
+        )
 
         # Initialize network monitor
-        self.network_monitor = NetworkMonitor(self.config["network"]["base_port"])
-        self.network_monitor.signals.connection_changed.connect(self._handle_connection_change)
+        self.network_monitor = NetworkMonitor(self._base_port)
+        self.network_monitor.signals.connections_diff.connect(self._handle_connections_diff)
         self.network_monitor.signals.monitoring_update.connect(self._handle_monitoring_update)
 
         # Calculate static positions for nodes in a circle
-        self.node_positions = None  # Will be calculated after nodes are created
+        self._node_ids = np.empty(0, dtype=int)  # Node ids in position order
+        self._pos_array = np.empty((0, 2))  # (N, 2) positions, row i for _node_ids[i]
+        self._node_colors = np.empty((0, 4))  # Fallback circle RGBA colors
+
+        # Cached matplotlib artists, rebuilt only when the topology changes
+        self._label_artists = {}
+        self._node_artists = {}  # node_id -> AnnotationBbox (drone icons)
+        self._node_artist = None  # PathCollection (fallback circles)
+        self._bg = None  # Background used for blitting the node artists
+        self._shown_master = None  # Master the node artists currently highlight
+        self._dirty = True  # Set whenever the view is out of date
+        self._closing = False  # Set by closeEvent so a pending setup does nothing
 
         # Set up the main window layout
         self._setup_main_layout()
 
-        # Initialize the network
-        self._setup_network()
+        # Importing matplotlib dominates startup, so the plot and the network
+        # are set up once the event loop runs and the window has been shown
+        QTimer.singleShot(0, self._setup_visualization)
+
+    def _setup_visualization(self):
+        """Create the network plot, start the network and the update timer"""
+        if self._closing:
+            return  # Closed before the event loop got here; start nothing
+        from matplotlib.image import imread
+
+        # Load drone images
+        try:
+            self.leader_img = imread("drone_leader.png")
+            self.follower_img = imread("drone_follower.png")
+        except Exception as e:
+            print(f"Error loading drone images: {e}")
+            # Fallback to simple shapes if images can't be loaded
+            self.leader_img = None
+            self.follower_img = None
 
-        # Set up update timer for periodic refresh
+        self._setup_canvas()
+
+        # Shrink the icons once to roughly their on-screen size so drawing
+        # them only needs a near 1:1 resample instead of a 128px rescale.
+        # The canvas scales the figure dpi by the device pixel ratio once
+        # shown, so high-dpi screens get a correspondingly smaller step
+        self._icon_zoom = ICON_ZOOM
+        if self.leader_img is not None and self.follower_img is not None:
+            device_dpi = self.figure.dpi * self.canvas.devicePixelRatioF()
+            step = max(1, round(72 / (ICON_ZOOM * device_dpi)))
+            self.leader_img = _shrink_image(self.leader_img, step)
+            self.follower_img = _shrink_image(self.follower_img, step)
+            self._icon_zoom = ICON_ZOOM * step
+
+        # Set up the update timer; it only runs once something changed and
+        # at most MAX_REDRAW_RATE times a second (or the display refresh rate,
+        # if lower), so bursts of kills and master changes coalesce
+        refresh = QApplication.primaryScreen().refreshRate() or 60
+        self._frame_interval = int(1000 / min(refresh, MAX_REDRAW_RATE))
         self.update_timer = QTimer()
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(self._frame_interval)
         self.update_timer.timeout.connect(self._update_visualization)
-        self.update_timer.start(1000)
+
+        # Initialize the network
+        self._setup_network()
 
     def _load_config(self, config_file):
         """Load network configuration from JSON file"""
         try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
+            with open(config_file, "rb") as f:
+                config = orjson.loads(f.read())
             return config
         except Exception as e:
             print(f"Error loading configuration: {e}")
 
     def _calculate_pyramid_layers(self, num_nodes):
         """Calculate how many nodes should be in each layer of the pyramid"""
-        layers = []
-        nodes_left = num_nodes - 1  # Excluding master node
-        current_layer = 1
-
-        while nodes_left > 0:
-            nodes_in_layer = min(current_layer * 2 - 1, nodes_left)
-            layers.append(nodes_in_layer)
-            nodes_left -= nodes_in_layer
-            current_layer += 1
-
-        return layers
+        return list(_pyramid_layers(num_nodes))
 
     def _calculate_node_positions(self):
         """Calculate positions for nodes in a rectangular grid layout"""
-        positions = {}
-        num_nodes = len(self.nodes)
-        
+        node_list = sorted(self.nodes.keys())  # Sort nodes by ID
+        num_nodes = len(node_list)
+        self._node_ids = np.array(node_list, dtype=int)
+        self._pos_array = np.empty((num_nodes, 2))
+        self._node_colors = np.tile(self._SLAVE_RGBA, (num_nodes, 1))
+
         if num_nodes == 0:
-            return positions
-            
+            return
+
         # Calculate grid dimensions
         # Try to make the grid as square as possible
         grid_cols = int(num_nodes ** 0.5)  # square root rounded down
         if grid_cols < 1:
             grid_cols = 1
         grid_rows = (num_nodes + grid_cols - 1) // grid_cols  # Ceiling division
-        
+
         # Calculate spacing
         margin = 0.2  # margin from edges
         spacing_x = (2.0 - 2 * margin) / max(grid_cols - 1, 1)
         spacing_y = (2.0 - 2 * margin) / max(grid_rows - 1, 1)
-        
-        # Place nodes in grid
-        node_list = sorted(self.nodes.keys())  # Sort nodes by ID
-        for i, node_id in enumerate(node_list):
-            row = i // grid_cols
-            col = i % grid_cols
-            
-            # Calculate position with margin
-            x = margin + col * spacing_x
-            y = margin + (grid_rows - 1 - row) * spacing_y  # Invert y to start from top
-            
-            positions[node_id] = (x, y)
-        
-        return positions
+
+        # Place nodes in grid, inverting y to start from the top
+        index = np.arange(num_nodes)
+        rows, cols = np.divmod(index, grid_cols)
+        self._pos_array[:, 0] = margin + cols * spacing_x
+        self._pos_array[:, 1] = margin + (grid_rows - 1 - rows) * spacing_y
 
     def _setup_main_layout(self):
         """Initialize the main window layout"""
         # Create main widget and layout
         main_widget = QWidget()
-        main_widget.setStyleSheet("background-color: white;")
+        main_widget.setStyleSheet(STYLESHEET)
         self.setCentralWidget(main_widget)
-        layout = QHBoxLayout(main_widget)
+        self._main_layout = QHBoxLayout(main_widget)
 
         # Add control panel
         control_panel = self._create_control_panel()
-        layout.addWidget(control_panel)
-
-        # Add network visualization
-        self.figure, self.ax = plt.subplots(figsize=(10, 8))
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas, stretch=2)
+        self._main_layout.addWidget(control_panel)
 
         # Add status bar
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
 
+    def _setup_canvas(self):
+        """Add the matplotlib network visualization next to the control panel"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.collections import LineCollection
+
+        # A bare Figure stays out of pyplot's global figure manager
+        self.figure = Figure(figsize=(10, 8))
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_title("Drone Network Topology", pad=20, fontsize=14)
+        # The view is fixed, so never let artists trigger autoscaling
+        self.ax.set_autoscale_on(False)
+        self.ax.set_xlim(0, 2)
+        self.ax.set_ylim(0, 2)
+        self.ax.tick_params(
+            axis="both", which="both",
+            bottom=False, left=False, labelbottom=False, labelleft=False,
+        )
+        # Edges are a single collection whose segments change with the topology
+        self._edge_artist = LineCollection(
+            [], colors="gray", alpha=0.3, linewidths=0.5, zorder=1
+        )
+        self.ax.add_collection(self._edge_artist, autolim=False)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self._main_layout.addWidget(self.canvas, stretch=2)
+
     def _create_control_panel(self):
         """Create the control panel with network information and controls"""
         panel = QWidget()
@@ -178,19 +321,15 @@ class NetworkVisualizerWindow(QMainWindow):
         status_layout = QVBoxLayout(status_group)
 
         title_label = QLabel("Network Status")
-        title_label.setStyleSheet("""
-            font-weight: bold;
-            font-size: 14px;
-            padding: 5px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-        """)
+        title_label.setObjectName("SectionTitle")
         status_layout.addWidget(title_label)
 
         self.master_label = QLabel("Master: Not Selected")
         self.active_nodes_label = QLabel("Active Nodes: 0")
-        self.master_label.setStyleSheet("color: black;")
-        self.active_nodes_label.setStyleSheet("color: black;")
+        for label in [self.master_label, self.active_nodes_label]:
+            label.setObjectName("StatusLabel")
+            # Runtime text is never rich text, so skip Qt's HTML detection
+            label.setTextFormat(Qt.PlainText)
         status_layout.addWidget(self.master_label)
         status_layout.addWidget(self.active_nodes_label)
         layout.addWidget(status_group)
@@ -201,23 +340,13 @@ class NetworkVisualizerWindow(QMainWindow):
         nodes_layout = QVBoxLayout(nodes_group)
 
         nodes_title = QLabel("Node List")
-        nodes_title.setStyleSheet("""
-            font-weight: bold;
-            font-size: 14px;
-            padding: 5px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-        """)
+        nodes_title.setObjectName("SectionTitle")
         nodes_layout.addWidget(nodes_title)
 
         self.nodes_list = QLabel()
-        self.nodes_list.setStyleSheet("""
-            padding: 5px;
-            background-color: white;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            color: black;
-        """)
+        self.nodes_list.setObjectName("NodeList")
+        self.nodes_list.setTextFormat(Qt.PlainText)
+        self.nodes_list.setTextInteractionFlags(Qt.NoTextInteraction)
         nodes_layout.addWidget(self.nodes_list)
         layout.addWidget(nodes_group)
 
@@ -228,13 +357,7 @@ class NetworkVisualizerWindow(QMainWindow):
 
         # Title
         monitor_title = QLabel("Network Monitor Stats")
-        monitor_title.setStyleSheet("""
-            font-weight: bold;
-            font-size: 14px;
-            padding: 5px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-        """)
+        monitor_title.setObjectName("SectionTitle")
         monitor_layout.addWidget(monitor_title)
 
         # Stats labels
@@ -243,16 +366,9 @@ class NetworkVisualizerWindow(QMainWindow):
         self.last_update_label = QLabel("Last Update: Never")
 
         # Style the labels
-        stats_style = """
-            padding: 5px;
-            background-color: white;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            color: black;
-            margin: 2px;
-        """
         for label in [self.total_connections_label, self.master_connections_label, self.last_update_label]:
-            label.setStyleSheet(stats_style)
+            label.setObjectName("StatsLabel")
+            label.setTextFormat(Qt.PlainText)
             monitor_layout.addWidget(label)
 
         layout.addWidget(monitor_group)
@@ -263,43 +379,15 @@ class NetworkVisualizerWindow(QMainWindow):
         buttons_layout = QVBoxLayout(buttons_group)
 
         controls_label = QLabel("Controls")
-        controls_label.setStyleSheet("""
-            font-weight: bold;
-            font-size: 14px;
-            padding: 5px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-            color: black;
-        """)
+        controls_label.setObjectName("SectionTitle")
         buttons_layout.addWidget(controls_label)
 
-        button_style = """
-            QPushButton {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 5px;
-                padding: 8px;
-                margin: 2px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #e9ecef;
-                border-color: #ced4da;
-            }
-            QPushButton:pressed {
-                background-color: #dee2e6;
-            }
-        """
-
         kill_master_btn = QPushButton("Kill Master Node")
         kill_random_btn = QPushButton("Kill Random Node")
         kill_random_btn.setEnabled(False)
         restore_btn = QPushButton("Restore Network")
         restore_btn.setEnabled(False)
 
-        for btn in [kill_master_btn, kill_random_btn, restore_btn]:
-            btn.setStyleSheet(button_style)
-
         kill_master_btn.clicked.connect(self._kill_master_node)
         kill_random_btn.clicked.connect(self._kill_random_node)
         restore_btn.clicked.connect(self._restore_network)
@@ -315,19 +403,13 @@ class NetworkVisualizerWindow(QMainWindow):
         legend_layout = QVBoxLayout(legend_group)
 
         legend_label = QLabel("Legend")
-        legend_label.setStyleSheet("""
-            font-weight: bold;
-            font-size: 14px;
-            padding: 5px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-        """)
+        legend_label.setObjectName("SectionTitle")
         legend_layout.addWidget(legend_label)
 
         master_legend = QLabel("● Red - Master Node")
-        master_legend.setStyleSheet("color: red; padding: 5px;")
+        master_legend.setObjectName("MasterLegend")
         slave_legend = QLabel("● Blue - Slave Node")
-        slave_legend.setStyleSheet("color: blue; padding: 5px;")
+        slave_legend.setObjectName("SlaveLegend")
 
         legend_layout.addWidget(master_legend)
         legend_layout.addWidget(slave_legend)
@@ -346,19 +428,19 @@ class NetworkVisualizerWindow(QMainWindow):
         
         # Clear existing network
         self.nodes.clear()
-        self.network_graph.clear()
-        
-        # Add a small delay to ensure ports are released
-        time.sleep(1)
+        self.network_edges.clear()
+
+        # No delay before rebinding: the sockets use SO_REUSEADDR and a node
+        # that still cannot bind retries on its own
 
         # Create nodes from configuration
-        for node_config in self.config["network"]["nodes"]:
+        for host, port, is_master in self._node_specs:
             try:
                 node = NetworkNode(
-                    host=node_config["host"],
-                    port=node_config["port"],
-                    is_master=node_config["is_master"],
-                    base_port=self.config["network"]["base_port"]
+                    host=host,
+                    port=port,
+                    is_master=is_master,
+                    base_port=self._base_port
                 )
                 # Set up signals
                 node.signals.master_changed.connect(self._handle_master_change)
@@ -369,7 +451,6 @@ class NetworkVisualizerWindow(QMainWindow):
                 node.start()
 
                 self.nodes[node.id] = node
-                self.network_graph.add_node(node.id)
 
                 if node.is_master:
                     self.master_node = node.id
@@ -378,123 +459,199 @@ class NetworkVisualizerWindow(QMainWindow):
                 print(f"Error creating node: {e}")
                 continue
         
-        # After creating all nodes
+        # After creating all nodes; ports never change, so sort only once
+        self._sorted_nodes = sorted(self.nodes.values(), key=lambda x: x.port)
         node_dict = {node.id: (node.host, node.port) for node in self.nodes.values()}
         self.network_monitor.stop_monitoring()  # Stop existing monitoring if any
         self.network_monitor.start_monitoring(node_dict)
 
         # Calculate node positions after creating nodes
-        self.node_positions = self._calculate_node_positions()
+        self._calculate_node_positions()
+
+        # Create edges for nearby nodes instead of fully connected; every
+        # node pair is checked at once, with i < j so tuples come out ordered
+        i, j = np.triu_indices(len(self._node_ids), k=1)
+        distance = np.hypot(*(self._pos_array[i] - self._pos_array[j]).T)
+        near = distance < 1  # Adjust this threshold as needed (adjacent in grid)
+        self.network_edges.update(
+            zip(self._node_ids[i[near]].tolist(), self._node_ids[j[near]].tolist())
+        )
+        self._shown_master = None  # Fresh colours and icons show no master yet
 
-        # Create edges for nearby nodes instead of fully connected
-        node_ids = list(self.nodes.keys())
-        positions = self._calculate_node_positions()
-        
-        # Calculate edges based on proximity
-        for i, node1_id in enumerate(node_ids):
-            for j, node2_id in enumerate(node_ids[i+1:], i+1):
-                # Calculate distance between nodes
-                pos1 = positions[node1_id]
-                pos2 = positions[node2_id]
-                distance = ((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)**0.5
-                
-                # Add edge if nodes are close enough (adjacent in grid)
-                if distance < 1:  # Adjust this threshold as needed
-                    self.network_graph.add_edge(node1_id, node2_id)
-
-        self._update_visualization()
-
-    def _handle_connection_change(self, connection_data):
-        node1_id, node2_id, is_connected = connection_data
-        if is_connected:
-            self.network_graph.add_edge(node1_id, node2_id)
-        else:
-            if self.network_graph.has_edge(node1_id, node2_id):
-                self.network_graph.remove_edge(node1_id, node2_id)
-        self._update_visualization()
+        self._draw_network()
+        self._update_status_info()
+
+    def _handle_connections_diff(self, added, removed):
+        """Apply one monitoring round's connection changes to the edges"""
+        # Ignore reports about nodes that have been killed
+        added = {edge for edge in added
+                 if edge[0] in self.nodes and edge[1] in self.nodes} - self.network_edges
+        removed = removed & self.network_edges
+        if added or removed:
+            self.network_edges |= added
+            self.network_edges -= removed
+            self._draw_network()
 
     def _handle_monitoring_update(self, timestamp):
         """Update the last monitoring timestamp"""
         self.last_update_label.setText(f"Last Update: {timestamp}")
 
-    def _update_visualization(self):
-        """Update the network visualization with drone icons and labels below"""
-        self.ax.clear()
-
-        if not self.nodes:
-            return
-
-        # Draw edges first (underneath nodes)
-        nx.draw_networkx_edges(
-            self.network_graph,
-            self.node_positions,
-            edge_color="gray",
-            alpha=0.3,
-            width=0.5,
-        )
-
-        # Draw nodes with drone icons and labels
-        for node_id in self.network_graph.nodes():
-            pos = self.node_positions[node_id]
-            is_master = node_id == self.master_node
-
-            # Draw the icon
-            if self.leader_img is not None and self.follower_img is not None:
-                img = self.leader_img if is_master else self.follower_img
-                imagebox = OffsetImage(img, zoom=0.15)
-                ab = AnnotationBbox(imagebox, pos, frameon=False, pad=0)
-                self.ax.add_artist(ab)
-            else:
-                # Fallback to circles if images aren't available
-                node_color = "red" if is_master else "lightblue"
-                nx.draw_networkx_nodes(
-                    self.network_graph,
-                    {node_id: pos},
-                    nodelist=[node_id],
-                    node_color=node_color,
-                    node_size=1500,  # Make all nodes the same size
-                )
-
-            # Add label below the icon
-            label_text = f"{self.nodes[node_id].address}\n(ID: {node_id})"
-            label_y_offset = -0.05  # Adjust this value to move labels up or down
-            self.ax.text(
-                pos[0],
-                pos[1] + label_y_offset,
-                label_text,
-                horizontalalignment="center",
-                verticalalignment="top",
-                fontsize=8,
+    def _draw_network(self):
+        """Update the edge, node and label artists after a topology change"""
+        # Edge segments are looked up from the position array in one go
+        edges = np.array(sorted(self.network_edges), dtype=int).reshape(-1, 2)
+        self._edge_artist.set_segments(self._pos_array[np.searchsorted(self._node_ids, edges)])
+
+        self._update_node_artists()
+        self._update_label_artists()
+
+        # Invalidate the background so the next update does a full draw
+        self._bg = None
+        self._schedule_update()
+
+    def _schedule_update(self):
+        """Mark the view out of date and schedule an update if none is pending"""
+        self._dirty = True
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+
+    def _update_node_artists(self):
+        """Create, move or remove the node artists so they match self.nodes"""
+        from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+
+        # Drone icons are animated so they can be blitted over the background
+        if self.leader_img is not None and self.follower_img is not None:
+            for node_id in self._node_artists.keys() - self.nodes.keys():
+                self._node_artists.pop(node_id).remove()
+
+            for node_id, pos in zip(self._node_ids.tolist(), self._pos_array):
+                ab = self._node_artists.get(node_id)
+                if ab is None:
+                    imagebox = OffsetImage(self.follower_img, zoom=self._icon_zoom)
+                    ab = AnnotationBbox(
+                        imagebox,
+                        pos,
+                        frameon=False,
+                        pad=0,
+                        animated=True,
+                    )
+                    self.ax.add_artist(ab)
+                    self._node_artists[node_id] = ab
+                else:
+                    ab.xy = ab.xybox = tuple(pos)
+        elif self._node_artist is None:
+            # Fallback to circles if images aren't available
+            self._node_artist = self.ax.scatter(
+                self._pos_array[:, 0],
+                self._pos_array[:, 1],
+                s=1500,  # Make all nodes the same size
+                c=self._node_colors,
+                zorder=2,
+                animated=True,
             )
+        else:
+            self._node_artist.set_offsets(self._pos_array)
+            self._node_artist.set_facecolors(self._node_colors)
+
+    def _update_label_artists(self):
+        """Create, move or remove the node labels so they match self.nodes"""
+        for node_id in self._label_artists.keys() - self.nodes.keys():
+            self._label_artists.pop(node_id).remove()
+
+        # Add label below each icon; fallback circles overlap the labels,
+        # so the labels then have to be blitted on top of them
+        label_y_offset = -0.05  # Adjust this value to move labels up or down
+        for node_id, (x, y) in zip(self._node_ids.tolist(), self._pos_array):
+            label_text = self.nodes[node_id].label
+            label = self._label_artists.get(node_id)
+            if label is None:
+                self._label_artists[node_id] = self.ax.text(
+                    x,
+                    y + label_y_offset,
+                    label_text,
+                    horizontalalignment="center",
+                    verticalalignment="top",
+                    fontsize=8,
+                    animated=self._node_artist is not None,
+                )
+            else:
+                label.set_position((x, y + label_y_offset))
+                if label.get_text() != label_text:
+                    label.set_text(label_text)
+
+    def _on_draw(self, event):
+        """Capture the background after a full draw and paint the nodes over it"""
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_node_artists()
+
+    def _draw_node_artists(self):
+        """Render the animated node artists onto the canvas"""
+        for ab in self._node_artists.values():
+            self.ax.draw_artist(ab)
+        if self._node_artist is not None:
+            self.ax.draw_artist(self._node_artist)
+            for label in self._label_artists.values():
+                self.ax.draw_artist(label)
 
-        # Set visualization properties
-        self.ax.set_title("Drone Network Topology", pad=20, fontsize=14)
-        self.ax.set_xlim(0, 2)
-        self.ax.set_ylim(0, 2)
-
+    def _update_visualization(self):
+        """Refresh node icons for the current master and blit them onto the cached background"""
+        if not self._dirty:
+            return
+        # Nothing is on screen while minimized or hidden; the pending update
+        # is rescheduled once the window comes back
+        if self.isMinimized() or not self.canvas.isVisible():
+            return
+        start = time.perf_counter()
+
+        # Node roles only need repainting when the master changed; kills keep
+        # the colour rows and icons of the surviving nodes
+        if self.master_node != self._shown_master:
+            if self._node_artists:
+                for node_id, ab in self._node_artists.items():
+                    is_master = node_id == self.master_node
+                    ab.offsetbox.set_data(self.leader_img if is_master else self.follower_img)
+            elif self._node_artist is not None:
+                self._node_colors[:] = self._SLAVE_RGBA
+                self._node_colors[self._node_ids == self.master_node] = self._MASTER_RGBA
+                self._node_artist.set_facecolors(self._node_colors)
+            self._shown_master = self.master_node
 
         # Update monitor statistics
-        total_connections = len(self.network_graph.edges())
-        master_connections = len([edge for edge in self.network_graph.edges() 
+        total_connections = len(self.network_edges)
+        master_connections = len([edge for edge in self.network_edges
                                 if self.master_node in edge]) if self.master_node is not None else 0
         
         self.total_connections_label.setText(f"Total Connections: {total_connections}")
         self.master_connections_label.setText(f"Master Connections: {master_connections}")
         self.last_update_label.setText(f"Last Update: {time.strftime('%H:%M:%S')}")
 
+        if self._bg is None:
+            # Let Qt coalesce full redraws; the draw_event handler then
+            # captures the new background
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self._bg)
+            self._draw_node_artists()
+            self.canvas.blit(self.ax.bbox)
 
-        self.canvas.draw()
-
-        # Update status information
-        self._update_status_info()
+        self._dirty = False
 
+        # Back off while frames take longer than the frame interval
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        self.update_timer.setInterval(max(self._frame_interval, elapsed_ms))
 
     def _update_status_info(self):
-        """Update status labels and node list"""
+        """Update status labels and node list; called whenever nodes or the master change"""
+        # Every slave reports the same master change, so skip repeats to
+        # save rebuilding the label strings; QLabel already ignores
+        # unchanged text
+        status = (self.master_node, tuple(node.id for node in self._sorted_nodes))
+        if status == self._last_status:
+            return
+        self._last_status = status
+
         # Update master info
-        master_node = next(
-            (node for node in self.nodes.values() if node.is_master), None
-        )
+        master_node = self.nodes.get(self.master_node)
         if master_node:
             self.master_label.setText(
                 f"Master: {master_node.address} (ID: {master_node.id})"
@@ -506,18 +663,16 @@ class NetworkVisualizerWindow(QMainWindow):
         self.active_nodes_label.setText(f"Active Nodes: {len(self.nodes)}")
 
         # Update nodes list
-        nodes_text = ""
-        for node in sorted(self.nodes.values(), key=lambda x: x.port):
-            status = "Master" if node.is_master else "Slave"
-            nodes_text += f"{node.address} (ID: {node.id}, {status})\n"
+        nodes_text = "".join(
+            f"{node.address} (ID: {node.id}, {'Master' if node.is_master else 'Slave'})\n"
+            for node in self._sorted_nodes
+        )
         self.nodes_list.setText(nodes_text)
 
     def _kill_master_node(self):
         """Handler for Kill Master Node button"""
         if self.nodes:
-            master_node = next(
-                (node for node in self.nodes.values() if node.is_master), None
-            )
+            master_node = self.nodes.get(self.master_node)
             if master_node:
                 self._kill_node(master_node.id)
                 self.statusBar.showMessage(f"Killed master node {master_node.address}")
@@ -525,36 +680,53 @@ class NetworkVisualizerWindow(QMainWindow):
     def _kill_random_node(self):
         """Handler for Kill Random Node button"""
         if self.nodes:
-            node_to_kill = random.choice(list(self.nodes.values()))
+            node_to_kill = random.choice(self._sorted_nodes)
             self._kill_node(node_to_kill.id)
             self.statusBar.showMessage(f"Killed node {node_to_kill.address}")
 
     def _kill_node(self, node_id):
         """Remove a node from the network and handle master election if needed"""
-        if node_id in self.nodes:
-            node = self.nodes[node_id]
-            was_master = node.is_master
-            
-            # Remove from data structures first
-            self.nodes.pop(node_id)
-            self.network_graph.remove_node(node_id)
-
-            # Stop the node after removing from data structures
+        self._kill_nodes([node_id])
+
+    def _kill_nodes(self, node_ids):
+        """Remove several nodes at once, with a single election and redraw"""
+        dead = {node_id for node_id in node_ids if node_id in self.nodes}
+        if not dead:
+            return
+        was_master = self.master_node in dead
+
+        # Remove from data structures first
+        dead_nodes = [self.nodes.pop(node_id) for node_id in dead]
+        self._sorted_nodes = [node for node in self._sorted_nodes if node.id not in dead]
+        self.network_edges = {edge for edge in self.network_edges if dead.isdisjoint(edge)}
+
+        # Stop the nodes after removing from data structures
+        for node in dead_nodes:
             node._cleanup_in_progress = True  # Prevent signal emission
             node.stop()
 
-            # Handle master election if needed
-            if was_master and self.nodes:
-                remaining_ids = list(self.nodes.keys())
-                if remaining_ids:
-                    new_master_id = max(remaining_ids)
-                    self.master_node = new_master_id
-                    for remaining_node in self.nodes.values():
-                        remaining_node.is_master = (remaining_node.id == new_master_id)
+        # Handle master election if needed; the other nodes are already slaves.
+        # Node ids grow with the port, so the last sorted node has the highest id
+        if was_master:
+            if self._sorted_nodes:
+                new_master = self._sorted_nodes[-1]
+                new_master.is_master = True
+                self.master_node = new_master.id
+            else:
+                self.master_node = None
+
+        # Drop the nodes' layout rows; the remaining nodes keep their place
+        keep = ~np.isin(self._node_ids, list(dead))
+        self._node_ids = self._node_ids[keep]
+        self._pos_array = self._pos_array[keep]
+        self._node_colors = self._node_colors[keep]
+        self._draw_network()
+        self._update_status_info()
 
-            # Recalculate node positions after removing a node
-            self.node_positions = self._calculate_node_positions()
-            self._update_visualization()
+    def _flush_node_deaths(self):
+        """Remove every node reported dead since the last flush in one pass"""
+        dead, self._pending_deaths = self._pending_deaths, set()
+        self._kill_nodes(dead)
 
     def _restore_network(self):
         """Handler for Restore Network button"""
@@ -564,18 +736,46 @@ class NetworkVisualizerWindow(QMainWindow):
     # Add these new methods to handle network events:
     def _handle_master_change(self, new_master_id):
         """Handle master node change events"""
+        # Only the current master has is_master set, so flip just the two nodes
+        old_master = self.nodes.get(self.master_node)
+        if old_master:
+            old_master.is_master = False
         self.master_node = new_master_id
-        for node in self.nodes.values():
-            node.is_master = (node.id == new_master_id)
-        self._update_visualization()
+        new_master = self.nodes.get(new_master_id)
+        if new_master:
+            new_master.is_master = True
+        self._schedule_update()
+        self._update_status_info()
 
     def _handle_node_death(self, node_id):
         """Handle node death events"""
         if node_id in self.nodes and not self.nodes[node_id]._cleanup_in_progress:
-            self._kill_node(node_id)
+            # Deaths tend to come in bursts (e.g. a partition), so collect
+            # them and remove them together once control returns to Qt
+            if not self._pending_deaths:
+                QTimer.singleShot(0, self._flush_node_deaths)
+            self._pending_deaths.add(node_id)
     
+    def changeEvent(self, event):
+        """Catch up on view updates skipped while the window was minimized"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self._resume_updates()
+
+    def showEvent(self, event):
+        """Catch up on view updates skipped while the window was hidden"""
+        super().showEvent(event)
+        self._resume_updates()
+
+    def _resume_updates(self):
+        """Schedule the update that was skipped while nothing was on screen"""
+        if self._dirty and hasattr(self, "update_timer"):
+            self._schedule_update()
+
     def closeEvent(self, event):
         """Handle application close event"""
+        self._closing = True
+
         # Safely stop all nodes
         nodes_to_stop = list(self.nodes.values())
         for node in nodes_to_stop:
@@ -584,6 +784,8 @@ class NetworkVisualizerWindow(QMainWindow):
                 node.stop()
         
         self.network_monitor.stop_monitoring()
+        if hasattr(self, "figure"):  # Not created if closed before setup ran
+            self.figure.clear()
 
         super().closeEvent(event)
 
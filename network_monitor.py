@@ -1,12 +1,17 @@
 import socket
-import json
+import orjson
 import time
 import threading
+import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal
 
+# Nodes answer any connection test the same way, so the probe never changes
+_PROBE_MESSAGE = orjson.dumps({'type': 'connection_test'})
+_PROBE_FRESHNESS = 10  # Seconds an answered probe is trusted without re-probing
+
 class NetworkMonitorSignals(QObject):
     """Signal handler for network monitoring events"""
-    connection_changed = pyqtSignal(tuple)  # (node1_id, node2_id, is_connected)
+    connections_diff = pyqtSignal(set, set)  # added, removed (node1_id, node2_id) tuples
     monitoring_update = pyqtSignal(str)  # timestamp of the monitoring update
 
 class NetworkMonitor:
@@ -16,7 +21,9 @@ class NetworkMonitor:
     def __init__(self, base_port=5000):
         self.base_port = base_port
         self.nodes = {}  # {node_id: (host, port)}
-        self.connections = set()  # Set of (node1_id, node2_id) tuples
+        self.adj = np.zeros((0, 0), dtype=np.uint8)  # adj[i, j] = 1 when pair (i, j), i < j, is connected
+        self._adj_ids = []  # Sorted node ids indexing the rows and columns of adj
+        self._last_ok = {}  # {node_id: monotonic time of its last probe answer}
         self.running = False
         self.monitor_thread = None
         self.signals = NetworkMonitorSignals()
@@ -24,6 +31,10 @@ class NetworkMonitor:
     def start_monitoring(self, nodes):
         """Start monitoring the provided nodes"""
         self.nodes = nodes
+        self._last_ok = {}
+        # A new run reports every connection afresh
+        self.adj = np.zeros((0, 0), dtype=np.uint8)
+        self._adj_ids = []
         self.running = True
         self.monitor_thread = threading.Thread(target=self._monitor_connections, daemon=True)
         self.monitor_thread.start()
@@ -34,76 +45,94 @@ class NetworkMonitor:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1)
             
-    def _check_connection(self, node1_id, node2_id):
-        """Check if two nodes can communicate with each other"""
+    def _probe_nodes(self, probe_socket, node_ids):
+        """Probe every node at once and return the ids of those that answered"""
+        # Drop late replies to the previous round's probes
+        probe_socket.setblocking(False)
         try:
-            # Create a temporary socket for testing
-            test_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            test_socket.settimeout(0.5)  # Short timeout for quick checks
-            
-            # Prepare test message
-            message = {
-                'type': 'connection_test',
-                'from_id': node1_id,
-                'timestamp': time.time()
-            }
-            
-            # Get node addresses
-            node1_host, node1_port = self.nodes[node1_id]
-            node2_host, node2_port = self.nodes[node2_id]
-            
-            # Try to send message
-            test_socket.sendto(json.dumps(message).encode(), (node2_host, node2_port))
-            
-            # Try to receive response
+            while True:
+                probe_socket.recvfrom(1024)
+        except OSError:
+            pass
+
+        for node_id in node_ids:
             try:
-                data, addr = test_socket.recvfrom(1024)
-                response = json.loads(data.decode())
-                if response.get('type') == 'connection_test_response':
-                    return True
-            except (socket.timeout, json.JSONDecodeError):
-                return False
-            finally:
-                test_socket.close()
-                
-        except Exception as e:
-            print(f"Error checking connection between nodes {node1_id} and {node2_id}: {e}")
-            return False
-            
-        return False
-        
+                probe_socket.sendto(_PROBE_MESSAGE, self.nodes[node_id])
+            except Exception as e:
+                print(f"Error probing node {node_id}: {e}")
+
+        # Collect responses until everyone answered or the timeout expires
+        responders = set()
+        deadline = time.monotonic() + 0.5  # Short timeout for quick checks
+        while len(responders) < len(node_ids):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            probe_socket.settimeout(remaining)
+            try:
+                data, addr = probe_socket.recvfrom(1024)
+                response = orjson.loads(data)
+            except socket.timeout:
+                break
+            except (OSError, orjson.JSONDecodeError):
+                continue
+            if response.get('type') == 'connection_test_response':
+                responders.add(response.get('from_id'))
+        return responders
+
     def _monitor_connections(self):
         """Continuously monitor connections between all nodes"""
-        while self.running:
-            current_connections = set()
-            
-            # Emit monitoring update signal with current timestamp
-            timestamp = time.strftime('%H:%M:%S')
-            self.signals.monitoring_update.emit(timestamp)
-            
-            # Check all possible node pairs
-            node_ids = list(self.nodes.keys())
-            for i, node1_id in enumerate(node_ids):
-                for node2_id in node_ids[i + 1:]:
-                    # Check if nodes can communicate
-                    is_connected = self._check_connection(node1_id, node2_id)
-                    
-                    # Store connection if exists
-                    if is_connected:
-                        current_connections.add(tuple(sorted([node1_id, node2_id])))
-                    
-                    # Emit signal if connection status changed
-                    connection = tuple(sorted([node1_id, node2_id]))
-                    was_connected = connection in self.connections
-                    if is_connected != was_connected:
-                        self.signals.connection_changed.emit((node1_id, node2_id, is_connected))
-            
-            # Update stored connections
-            self.connections = current_connections
-            
-            # Wait before next check
-            time.sleep(5)  # 5-second refresh interval
-            
+        # One socket serves every probe of this monitoring run
+        probe_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            while self.running:
+                # Emit monitoring update signal with current timestamp
+                timestamp = time.strftime('%H:%M:%S')
+                self.signals.monitoring_update.emit(timestamp)
+
+                # A pair counts as connected when its second node answers, so
+                # each node only needs to be probed once per round
+                # Sorted, so every pair below is already (smaller, larger)
+                node_ids = sorted(self.nodes)
+                now = time.monotonic()
+                # Nodes that answered recently are taken as still reachable
+                responders = {node_id for node_id in node_ids[1:]
+                              if now - self._last_ok.get(node_id, float('-inf')) < _PROBE_FRESHNESS}
+                answered = self._probe_nodes(
+                    probe_socket, [node_id for node_id in node_ids[1:] if node_id not in responders])
+                for node_id in answered:
+                    self._last_ok[node_id] = now
+                responders |= answered
+
+                # Adjacency of all node pairs at once: (i, j) with i < j is
+                # connected when node j answered
+                reachable = np.isin(node_ids, list(responders))
+                adjacency = np.triu(
+                    np.broadcast_to(reachable, (len(node_ids), len(node_ids))), k=1
+                ).astype(np.uint8)
+                if node_ids != self._adj_ids:
+                    # Different nodes, so the previous matrix does not line up
+                    self.adj = np.zeros_like(adjacency)
+                    self._adj_ids = node_ids
+
+                # Report every change of this round in a single signal
+                rows, cols = np.nonzero(adjacency ^ self.adj)
+                if rows.size:
+                    added, removed = set(), set()
+                    for i, j in zip(rows.tolist(), cols.tolist()):
+                        changed = added if adjacency[i, j] else removed
+                        changed.add((node_ids[i], node_ids[j]))
+                    self.signals.connections_diff.emit(added, removed)
+
+                # Update stored connections
+                self.adj = adjacency
+
+                # Wait before next check
+                time.sleep(5)  # 5-second refresh interval
+        finally:
+            probe_socket.close()
+
     def get_active_connections(self):
         """Return the current set of active connections"""
-        return self.connections.copy()
\ No newline at end of file
+        ids, adj = self._adj_ids, self.adj
+        return {(ids[i], ids[j]) for i, j in zip(*np.nonzero(adj))}
\ No newline at end of file
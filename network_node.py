@@ -1,10 +1,52 @@
+import asyncio
 import socket
 import threading
 import time
-import json
+import orjson
 import re
+import struct
+from functools import lru_cache
 from PyQt5.QtCore import QObject, pyqtSignal
 
+_DIGITS_RE = re.compile(r'\d+')
+_MASTER_TIMEOUT_NS = 3_000_000_000  # Heartbeat silence before a slave starts an election
+_RECV_BATCH = 32  # Most datagrams handled per readiness callback
+
+# Heartbeats and elections travel as fixed binary frames: message type,
+# sender id, master id (or proposed master) and timestamp. Connection tests
+# stay JSON; JSON datagrams always start with '{', which no frame type uses
+_FRAME = struct.Struct('<BIId')
+_HEARTBEAT = 1
+_ELECTION = 2
+_ELECTION_ACK = 3  # Receipt for a datagram of election frames
+_ACK_TIMEOUT = 0.5  # Seconds to wait for a successor's receipt before skipping it
+
+_loop = None
+_loop_lock = threading.Lock()
+
+@lru_cache(maxsize=256)
+def _host_id(host):
+    """Sum of numerical values in a host address, cached per host string"""
+    return sum(map(int, _DIGITS_RE.findall(host)))
+
+@lru_cache(maxsize=256)
+def _numeric_host(host):
+    """IPv4 address for a host name, so sendto never has to resolve it"""
+    try:
+        return socket.gethostbyname(host)
+    except OSError:
+        return host  # Leave the error to surface when sending
+
+def _event_loop():
+    """Shared event loop, run in one background thread, that drives every node"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            # A selector loop so add_reader() also works on Windows
+            _loop = asyncio.SelectorEventLoop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
 class NetworkSignals(QObject):
     """Signal handler for network events"""
     master_changed = pyqtSignal(int)  # Emitted when master node changes
@@ -22,13 +64,26 @@ class NetworkNode:
         self.address = f"{host}:{self.port}"
         self.is_active = True
         self.id = self.port - base_port
+        self.label = f"{self.address}\n(ID: {self.id})"  # Plot label, fixed for the node's lifetime
         
         # Network properties
         self.peers = {}
+        self._peer_addrs = []  # Peer (host, port) tuples, rebuilt whenever peers change
+        self._ring = []  # (id, address) of the other configured nodes, in election ring order
+        self._gone = set()  # Ids of masters whose heartbeats stopped and silent successors
+        self._unacked_id = None  # Successor whose receipt for _unacked is awaited
+        self._unacked = []  # Election frames sent to it but not yet acknowledged
+        self._ack_timer = None  # Pending receipt timeout on the loop
+        self._configured_master_id = None  # Master named in the config, until a heartbeat says otherwise
         self.master_id = 0 if is_master else None
         self.socket = None  # Initialize socket as None
         self.alive = True
-        self.last_heartbeat = time.time()
+        self._loop = None  # Shared event loop, set by start()
+        self._timer = None  # Pending heartbeat or master check on the loop
+        self._rx_buffer = bytearray(2048)  # Receive buffer reused for every datagram
+        self._rx_view = memoryview(self._rx_buffer)
+        self._tx_frames = None  # Successor frames held back while a batch is read
+        self.last_heartbeat = time.monotonic_ns()  # Local receive time, not wall clock
         
         # Qt signals
         self.signals = NetworkSignals()
@@ -61,36 +116,99 @@ class NetworkNode:
 
     def _calculate_host_id(self, host):
         """Calculate node ID based on sum of numerical values in host address"""
-        numbers = re.findall(r'\d+', host)
-        return sum(int(num) for num in numbers) if numbers else 0
+        return _host_id(host)
 
     def start(self):
         """Start the node's network operations"""
         # Initialize peer connections
-        for peer_config in self.config.get('network', {}).get('nodes', []):
+        nodes_config = self.config.get('network', {}).get('nodes', [])
+        for peer_config in nodes_config:
             peer_id = self._calculate_host_id(peer_config['host'])
             if peer_id != self.id:
                 self.peers[peer_id] = (peer_config['host'], peer_config['port'])
+        self._peer_addrs = [(_numeric_host(host), port) for host, port in self.peers.values()]
+
+        # Election messages travel around a ring of the configured nodes,
+        # ordered by port; each node only ever sends them to the next live one
+        ring = sorted((peer_config['port'], peer_config['host']) for peer_config in nodes_config)
+        ports = [port for port, host in ring]
+        if self.port in ports:
+            index = ports.index(self.port)
+            base_port = self.port - self.id
+            self._ring = [(port - base_port, (_numeric_host(host), port))
+                          for port, host in ring[index + 1:] + ring[:index]]
+            for peer_config in nodes_config:
+                if peer_config.get('is_master'):
+                    self._configured_master_id = peer_config['port'] - base_port
+
+        # All nodes share one event loop thread instead of running their own
+        # listener and heartbeat/monitor threads
+        self._loop = _event_loop()
+        self._loop.call_soon_threadsafe(self._attach)
 
-        # Start listening thread
-        threading.Thread(target=self._listen, daemon=True).start()
+    def _attach(self):
+        """Register the socket and the periodic work with the event loop"""
+        if not self.alive:
+            return
+        self.socket.setblocking(False)
+        self._loop.add_reader(self.socket.fileno(), self._on_readable)
 
-        # Start appropriate monitoring thread
+        # Start appropriate periodic work
         if self.is_master:
-            threading.Thread(target=self._send_heartbeat, daemon=True).start()
+            self._send_heartbeat()
         else:
-            threading.Thread(target=self._monitor_master, daemon=True).start()
+            self._monitor_master()
+
+    def _detach(self, sock):
+        """Unregister from the event loop and close the socket"""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+        try:
+            self._loop.remove_reader(sock.fileno())
+        except Exception:
+            pass
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+    def _on_readable(self):
+        """Handle every datagram waiting on the socket, up to a batch"""
+        self._tx_frames = []
+        try:
+            self._read_batch()
+        finally:
+            # Everything the batch queued for the successor goes out as one datagram
+            frames, self._tx_frames = self._tx_frames, None
+            if frames:
+                self._send_to_successor(b''.join(frames))
 
-    def _listen(self):
-        """Listen for incoming network messages"""
-        while self.alive:
+    def _read_batch(self):
+        """Read and dispatch up to a batch of waiting datagrams"""
+        for _ in range(_RECV_BATCH):
             try:
-                data, addr = self.socket.recvfrom(1024)
-                message = json.loads(data.decode())
-                self._handle_message(message, addr)
+                # Received into one reusable buffer; data is only valid until
+                # the next datagram is read
+                size, addr = self.socket.recvfrom_into(self._rx_buffer)
+                data = self._rx_view[:size]
+            except BlockingIOError:
+                return
             except Exception as e:
                 if self.alive:  # Only print if not deliberately stopped
                     print(f"Node {self.id} error: {e}")
+                return
+
+            try:
+                if data[:1] == b'{':
+                    message = orjson.loads(data)
+                    self._handle_message(message, addr)
+                else:
+                    self._handle_frame(data, addr)
+            except Exception as e:
+                if self.alive:
+                    print(f"Node {self.id} error: {e}")
 
     def _handle_message(self, message, addr):
         """Handle received network messages"""
@@ -103,63 +221,147 @@ class NetworkNode:
                 'from_id': self.id,
                 'timestamp': time.time()
             }
-            self.socket.sendto(json.dumps(response).encode(), addr)
+            self.socket.sendto(orjson.dumps(response), addr)
+
+    def _handle_frame(self, data, addr):
+        """Handle received heartbeat, election and receipt frames"""
+        # A datagram may carry several frames back to back
+        for offset in range(0, len(data), _FRAME.size):
+            self._handle_single_frame(data[offset:offset + _FRAME.size])
+
+        # Election frames only ever share a datagram with other election
+        # frames; confirm receipt so the sender keeps this node as successor
+        if data[0] == _ELECTION:
+            self.socket.sendto(_FRAME.pack(_ELECTION_ACK, self.id, 0, time.time()), addr)
+
+    def _handle_single_frame(self, data):
+        """Handle one heartbeat or election frame"""
+        msg_type, sender_id, master_id, timestamp = _FRAME.unpack(data)
 
-        if msg_type == 'heartbeat':
+        if msg_type == _HEARTBEAT:
             if not self.is_master:
-                self.last_heartbeat = time.time()
+                self.last_heartbeat = time.monotonic_ns()
+                self._gone.discard(sender_id)
                 # Update master information
-                new_master_id = message.get('master_id')
-                if new_master_id != self.master_id:
-                    self.master_id = new_master_id
-                    self.signals.master_changed.emit(new_master_id)
+                if master_id != self.master_id:
+                    self.master_id = master_id
+                    self.signals.master_changed.emit(master_id)
 
-        elif msg_type == 'master_election':
+        elif msg_type == _ELECTION:
             if not self.is_master:
-                proposed_master = message.get('proposed_master')
-                if proposed_master > self.id:
-                    # Forward the election message
-                    self._broadcast_message(message)
-                elif proposed_master < self.id:
+                if master_id > self.id:
+                    # Forward the election frame as received
+                    self._send_to_successor(data)
+                elif master_id < self.id:
                     # Propose self as master
                     self._initiate_election()
+                # A proposal equal to self.id has gone all the way round, so
+                # this is the highest live node. Nodes never promote
+                # themselves, though: the GUI picks the new master
+
+        elif msg_type == _ELECTION_ACK:
+            self._gone.discard(sender_id)
+            if sender_id == self._unacked_id:
+                self._clear_unacked()
 
     def _send_heartbeat(self):
         """Send periodic heartbeat messages if master"""
-        while self.alive and self.is_master:
-            message = {
-                'type': 'heartbeat',
-                'master_id': self.id,
-                'timestamp': time.time()
-            }
-            self._broadcast_message(message)
-            time.sleep(1)
+        if self.alive and self.is_master:
+            self._broadcast_message(_FRAME.pack(_HEARTBEAT, self.id, self.id, time.time()))
+            self._timer = self._loop.call_later(1, self._send_heartbeat)
 
     def _monitor_master(self):
         """Monitor master node's heartbeat"""
-        while self.alive and not self.is_master:
-            if time.time() - self.last_heartbeat > 3:  # Master timeout
+        if self.alive and not self.is_master:
+            remaining = self.last_heartbeat + _MASTER_TIMEOUT_NS - time.monotonic_ns()
+            if remaining >= 0:
+                # Check again at the deadline; heartbeats received meanwhile
+                # just move it, which is picked up then
+                self._timer = self._loop.call_later(remaining / 1e9, self._monitor_master)
+            else:
+                # The silent master must not stay in the election ring; a
+                # node that never got a heartbeat assumes the configured one
+                master_id = self.master_id
+                if master_id is None:
+                    master_id = self._configured_master_id
+                if master_id is not None:
+                    self._gone.add(master_id)
                 self._initiate_election()
-            time.sleep(1)
+                # Retry once a second while the master is silent
+                self._timer = self._loop.call_later(1, self._monitor_master)
 
     def _initiate_election(self):
         """Start master election process"""
-        message = {
-            'type': 'master_election',
-            'proposed_master': self.id,
-            'timestamp': time.time()
-        }
-        self._broadcast_message(message)
+        self._send_to_successor(_FRAME.pack(_ELECTION, self.id, self.id, time.time()))
+
+    def _successor(self):
+        """(id, address) of the next ring node that is neither the master nor gone
+
+        Frames go to a single successor at a time. A successor that
+        acknowledged frames but dies before forwarding them still loses
+        them; the round recovers when the slaves retry their election.
+        """
+        # Elections only run while the master is silent, and the master
+        # drops election frames anyway
+        for node_id, address in self._ring:
+            if node_id != self.master_id and node_id not in self._gone:
+                return node_id, address
+        return None
+
+    def _send_to_successor(self, data):
+        """Pass encoded election frames on to the next node in the ring"""
+        if self._tx_frames is not None:
+            # Copied, as received frames point into the reusable buffer
+            self._tx_frames.append(bytes(data))
+            return
+        successor = self._successor()
+        if successor is None:
+            return
+        node_id, address = successor
+        try:
+            self.socket.sendto(data, address)
+        except Exception as e:
+            if self.alive:  # Only print if not deliberately stopped
+                print(f"Error sending to {address[0]}:{address[1]}: {e}")
+
+        # Keep the frames until the successor confirms them
+        if node_id != self._unacked_id:
+            self._clear_unacked()
+            self._unacked_id = node_id
+            self._ack_timer = self._loop.call_later(_ACK_TIMEOUT, self._on_ack_timeout)
+        self._unacked.append(bytes(data))
+
+    def _clear_unacked(self):
+        """Forget frames awaiting a receipt and stop waiting for it"""
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        self._unacked_id = None
+        self._unacked = []
+
+    def _on_ack_timeout(self):
+        """Skip a successor that did not confirm its frames and resend them"""
+        self._ack_timer = None
+        if not self.alive:
+            return
+        self._gone.add(self._unacked_id)
+        frames = self._unacked
+        self._clear_unacked()
+        self._send_to_successor(b''.join(frames))
 
     def _broadcast_message(self, message):
-        """Broadcast message to all peers"""
-        for node_id, (host, port) in self.peers.items():
+        """Broadcast a message dict, or an already encoded one, to all peers"""
+        if isinstance(message, bytes):
+            data = message
+        else:
+            data = orjson.dumps(message)  # Same payload for every peer
+        sock = self.socket
+        for address in self._peer_addrs:
             try:
-                data = json.dumps(message).encode()
-                self.socket.sendto(data, (host, port))
+                sock.sendto(data, address)
             except Exception as e:
                 if self.alive:  # Only print if not deliberately stopped
-                    print(f"Error sending to node {node_id}: {e}")
+                    print(f"Error sending to {address[0]}:{address[1]}: {e}")
 
     def stop(self):
         """Stop the node's network operations"""
@@ -168,16 +370,15 @@ class NetworkNode:
             self.alive = False
             self.is_active = False
             
-            # Close socket
+            # Close socket; once started, the event loop thread owns it
             if self.socket:
-                try:
-                    self.socket.shutdown(socket.SHUT_RDWR)
-                except Exception:
-                    pass
-                try:
-                    self.socket.close()
-                except Exception:
-                    pass
+                if self._loop is not None:
+                    self._loop.call_soon_threadsafe(self._detach, self.socket)
+                else:
+                    try:
+                        self.socket.close()
+                    except Exception:
+                        pass
                 self.socket = None
             
             # Emit signal only if not already cleaning up